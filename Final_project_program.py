@@ -1,10 +1,26 @@
+import argparse
+import bisect
+import json
+import math
+import operator
+import os
 import random
+import socket
+import stat
+import struct
+import sys
 import textwrap
+import threading
 import time
-def main()
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import accumulate, repeat
 
 try:
     import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
     MATPLOTLIB_AVAILABLE = True
 except Exception:
     MATPLOTLIB_AVAILABLE = False
@@ -96,12 +112,71 @@ class Portfolio:
         print(f"  Total value: ${self.total_value(market):.2f}")
 
 
+TRADING_DAY_SECONDS = 23400  # 9:30 to 16:00
+CANDLE_INTERVALS = {"minute": 60, "hour": 3600, "day": TRADING_DAY_SECONDS}
+
+
+class CandleSeries:
+    """
+    Open, high, low, close candles for one ticker at one interval.
+    Ticks are folded in as they arrive and only the newest `limit`
+    candles are kept, so memory does not grow with the number of ticks.
+    """
+
+    def __init__(self, seconds, limit=500):
+        self.seconds = seconds
+        self.finished = deque(maxlen=limit)
+        self.current = None  # [start, open, high, low, close]
+
+    def add_ticks(self, times, prices):
+        """
+        Add a batch of ticks. `times` must be sorted, in seconds.
+        """
+        i = 0
+        while i < len(times):
+            # Candles line up with the 9:30 open, not with midnight.
+            start = times[i] - times[i] % TRADING_DAY_SECONDS % self.seconds
+            j = bisect.bisect_left(times, start + self.seconds, i)
+            chunk = prices[i:j]
+            self.merge(start, chunk[0], max(chunk), min(chunk), chunk[-1])
+            i = j
+
+    def merge(self, start, open_price, high, low, close):
+        current = self.current
+        if current is not None and current[0] == start:
+            current[2] = max(current[2], high)
+            current[3] = min(current[3], low)
+            current[4] = close
+            return
+        if current is not None:
+            self.finished.append(tuple(current))
+        self.current = [start, open_price, high, low, close]
+
+    def candles(self):
+        result = list(self.finished)
+        if self.current is not None:
+            result.append(tuple(self.current))  # still being built
+        return result
+
+
+def candle_label(start):
+    """
+    "Day 3 10:30" style label for a candle's start time.
+    """
+    day = start // TRADING_DAY_SECONDS + 1
+    minutes = 9 * 60 + 30 + (start % TRADING_DAY_SECONDS) // 60
+    return f"Day {day} {minutes // 60:>2}:{minutes % 60:02d}"
+
+
 class StockMarket:
     """
     Very simple mock stock market for SAFE, GROW and YOLO stocks.
+
+    With ticks_per_day set, each day is built from many small price moves
+    that are rolled up into minute, hour and day candles.
     """
 
-    def __init__(self):
+    def __init__(self, ticks_per_day=None, candle_limit=500, rng=None):
         self.prices = {
             "SAFE": 50.0,   # low risk
             "GROW": 35.0,   # medium risk
@@ -109,26 +184,70 @@ class StockMarket:
         }
         self.history = {ticker: [price] for ticker, price in self.prices.items()}
         self.day = 0
+        self.listeners = []  # called with the market after every day
+        self.rng = rng or session_random()
+        if ticks_per_day is not None and ticks_per_day <= 0:
+            raise ValueError("ticks_per_day must be more than 0.")
+        self.ticks_per_day = ticks_per_day
+        self.candles = {}
+        if ticks_per_day:
+            self.candles = {
+                ticker: {name: CandleSeries(seconds, candle_limit)
+                         for name, seconds in CANDLE_INTERVALS.items()}
+                for ticker in self.prices
+            }
+
+    def max_daily_move(self, ticker):
+        if ticker == "SAFE":
+            return 0.015
+        elif ticker == "GROW":
+            return 0.03
+        return 0.07
 
     def simulate_day(self):
         """
         Move each stock price a random percent each day.
         """
         self.day += 1
-        for ticker in self.prices:
-            current = self.prices[ticker]
+        if self.ticks_per_day:
+            self.simulate_intraday()
+        else:
+            for ticker in self.prices:
+                current = self.prices[ticker]
+                move = self.max_daily_move(ticker)
+                change_percent = self.rng.uniform(-move, move)
 
-            if ticker == "SAFE":
-                change_percent = random.uniform(-0.015, 0.015)
-            elif ticker == "GROW":
-                change_percent = random.uniform(-0.03, 0.03)
-            else:
-                change_percent = random.uniform(-0.07, 0.07)
+                new_price = current * (1 + change_percent)
+                new_price = max(new_price, 1.0)  # do not drop below 1
+                self.prices[ticker] = new_price
+                self.history[ticker].append(new_price)
 
-            new_price = current * (1 + change_percent)
-            new_price = max(new_price, 1.0)  # do not drop below 1
-            self.prices[ticker] = new_price
-            self.history[ticker].append(new_price)
+        for listener in self.listeners:
+            listener(self)
+
+    def simulate_intraday(self):
+        """
+        Generate all of today's ticks at once and roll them into candles.
+        Only the closing price goes into history.
+        """
+        n = self.ticks_per_day
+        day_start = (self.day - 1) * TRADING_DAY_SECONDS
+        times = [day_start + i * TRADING_DAY_SECONDS // n for i in range(n)]
+        rand = self.rng.random
+        for ticker in self.prices:
+            # n small uniform moves add up to the same spread as the
+            # single daily move used without ticks.
+            width = 2 * self.max_daily_move(ticker) / math.sqrt(n)
+            low = 1 - width / 2
+            steps = [low + width * rand() for _ in range(n)]
+            prices = list(accumulate(steps, operator.mul, initial=self.prices[ticker]))[1:]
+            if min(prices) < 1.0:
+                prices = [max(p, 1.0) for p in prices]  # do not drop below 1
+
+            for series in self.candles[ticker].values():
+                series.add_ticks(times, prices)
+            self.prices[ticker] = prices[-1]
+            self.history[ticker].append(prices[-1])
 
     def print_table(self):
         print(f"\nDay {self.day} prices:")
@@ -158,6 +277,69 @@ class StockMarket:
             print(f"  Day {self.day - len(prices) + 1 + i:>3}: "
                   f"{bar} ${p:6.2f}")
 
+    def print_ascii_candles(self, ticker, interval, last_n=15):
+        """
+        Text candle chart. Dashes run from low to high, # marks open to
+        close, and + or - says whether the price ended up or down.
+        """
+        candles = self.candles.get(ticker, {}).get(interval)
+        candles = candles.candles()[-last_n:] if candles else []
+        if not candles:
+            print("No candles to chart yet.")
+            return
+
+        max_price = max(c[2] for c in candles)
+        min_price = min(c[3] for c in candles)
+        span = max_price - min_price if max_price != min_price else 1
+
+        def column(price):
+            return int((price - min_price) / span * 30)
+
+        print(f"\n{interval.capitalize()} candles for {ticker} (last {len(candles)})")
+        for start, open_price, high, low, close in candles:
+            row = [" "] * 31
+            for col in range(column(low), column(high) + 1):
+                row[col] = "-"
+            body = sorted((column(open_price), column(close)))
+            for col in range(body[0], body[1] + 1):
+                row[col] = "#"
+            direction = "+" if close >= open_price else "-"
+            print(f"  {candle_label(start)}: {''.join(row)} {direction} "
+                  f"O {open_price:6.2f} H {high:6.2f} L {low:6.2f} C {close:6.2f}")
+
+    def plot_candle_chart(self, ticker, interval, last_n=60):
+        """
+        Candle chart using matplotlib.
+        """
+        if not MATPLOTLIB_AVAILABLE:
+            print("\nMatplotlib is not installed. Install it with:")
+            print("  pip install matplotlib")
+            return
+
+        candles = self.candles.get(ticker, {}).get(interval)
+        candles = candles.candles()[-last_n:] if candles else []
+        if not candles:
+            print("No candles to chart yet.")
+            return
+        if skip_chart(f"{ticker} {interval} candles"):
+            return
+
+        xs = list(range(len(candles)))
+        colors = ["green" if c[4] >= c[1] else "red" for c in candles]
+        bottoms = [min(c[1], c[4]) for c in candles]
+        heights = [max(abs(c[4] - c[1]), 0.001) for c in candles]
+
+        plt.figure()
+        plt.vlines(xs, [c[3] for c in candles], [c[2] for c in candles], colors=colors)
+        plt.bar(xs, heights, bottom=bottoms, color=colors, width=0.6)
+        step = max(1, len(candles) // 6)
+        plt.xticks(xs[::step], [candle_label(c[0]) for c in candles[::step]], rotation=30)
+        plt.title(f"{ticker} {interval} candles")
+        plt.ylabel("Price")
+        plt.grid(True)
+        plt.tight_layout()
+        plt.show()
+
     def plot_matplotlib_chart(self, ticker):
         """
         Real line chart using matplotlib.
@@ -172,22 +354,183 @@ class StockMarket:
             print("No prices to chart yet.")
             return
 
+        show_line_chart(*self.chart_data(ticker))
+
+    def chart_data(self, ticker):
+        """
+        Arguments for a line chart of one ticker's price history.
+        """
+        prices = self.history.get(ticker, [])
         days = list(range(len(prices)))
-        plt.figure()
-        plt.plot(days, prices, marker="o")
-        plt.title(f"{ticker} price history")
-        plt.xlabel("Day")
-        plt.ylabel("Price")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
+        return days, prices, f"{ticker} price history", "Day", "Price", "o"
+
+
+
+
+# Every prompt and pause goes through read_line and pause so a session can
+# be recorded or replayed without a person at the keyboard.
+_session_state = threading.local()
+
+
+def current_session():
+    return getattr(_session_state, "session", None)
+
+
+def read_line(prompt=""):
+    session = current_session()
+    if session is None:
+        return input(prompt)
+    return session.answer(prompt)
+
+
+def pause(seconds):
+    session = current_session()
+    if session is None:
+        time.sleep(seconds)
+    else:
+        session.pause(seconds)
+
+
+def session_random():
+    """
+    The current session's random number generator, so a recorded session
+    replays with the same prices. Outside a session this is the random
+    module itself.
+    """
+    return getattr(current_session(), "rng", None) or random
+
+
+class TranscriptMismatch(Exception):
+    """
+    A replayed session asked a different question than the recording did,
+    so the saved answers no longer line up.
+    """
+
+
+class RecordingSession:
+    """
+    Plays the program normally but writes down every prompt and answer,
+    plus the seed and tick setting that decide the market's prices and
+    which chart questions get asked.
+    """
+
+    def __init__(self, seed=None, ticks_per_day=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.ticks_per_day = ticks_per_day
+        self.rng = random.Random(self.seed)
+        self.steps = []  # (prompt, answer)
+
+    def answer(self, prompt):
+        value = input(prompt)
+        self.steps.append((prompt, value))
+        return value
+
+    def pause(self, seconds):
+        time.sleep(seconds)
+
+    def save(self, path):
+        transcript = {
+            "seed": self.seed,
+            "ticks_per_day": self.ticks_per_day,
+            "steps": [list(step) for step in self.steps],
+        }
+        with open(path, "w") as f:
+            json.dump(transcript, f, indent=2)
+
+
+class ReplaySession:
+    """
+    Feeds saved answers back into the program.
+    Sleeps are only added to a virtual clock and printed text is thrown
+    away, so many of these can run at the same time.
+    """
+
+    MENU_PROMPT = "Choose an option: "
+
+    def __init__(self, transcript):
+        self.steps = transcript["steps"]
+        self.rng = random.Random(transcript["seed"])
+        self.status = "running"
+        self.position = 0
+        self.virtual_seconds = 0.0
+        self.heading = "Start"
+        self.action = None
+        self.action_start = 0.0
+        self.timings = []  # (action label, seconds)
+        self.charts_skipped = 0
+
+    def answer(self, prompt):
+        if prompt == self.MENU_PROMPT:
+            self.finish_action()
+        if self.position >= len(self.steps):
+            raise EOFError("Transcript ran out of answers.")
+        expected, value = self.steps[self.position]
+        if prompt != expected:
+            raise TranscriptMismatch(
+                f"Step {self.position + 1} expected {expected!r} but got {prompt!r}."
+            )
+        self.position += 1
+        if prompt == self.MENU_PROMPT:
+            self.action = f"{self.heading} / {value.strip()}"
+            self.action_start = time.perf_counter()
+        return value
+
+    def pause(self, seconds):
+        self.virtual_seconds += seconds
+
+    def show_chart(self, title):
+        self.charts_skipped += 1  # no windows or figures during replay
+
+    def write(self, text):
+        # Remember the last menu heading so timings can be labeled by it.
+        stripped = text.strip()
+        if stripped.startswith("=====") or stripped.startswith("-----"):
+            self.heading = stripped.strip("=- ")
+        return len(text)
+
+    def finish_action(self):
+        if self.action is not None:
+            elapsed = time.perf_counter() - self.action_start
+            self.timings.append((self.action, elapsed))
+            self.action = None
+
+    def result(self):
+        """
+        Small picklable summary, so worker processes can send it back.
+        """
+        return {
+            "status": self.status,
+            "timings": self.timings,
+            "virtual_seconds": self.virtual_seconds,
+            "charts_skipped": self.charts_skipped,
+        }
+
+
+class SessionOutput:
+    """
+    Stand-in for sys.stdout that sends text from replay threads to their
+    own session instead of the terminal.
+    """
+
+    def __init__(self, real_stdout):
+        self.real_stdout = real_stdout
+
+    def write(self, text):
+        session = current_session()
+        if session is None or not hasattr(session, "write"):
+            return self.real_stdout.write(text)
+        return session.write(text)
+
+    def flush(self):
+        if current_session() is None:
+            self.real_stdout.flush()
 
 
 
 
 def ask_int(prompt, min_value=None, max_value=None):
     while True:
-        value_str = input(prompt)
+        value_str = read_line(prompt)
         if value_str.strip() == "":
             print("Please enter a number.")
             continue
@@ -208,7 +551,7 @@ def ask_int(prompt, min_value=None, max_value=None):
 
 def ask_float(prompt, min_value=None, max_value=None):
     while True:
-        value_str = input(prompt)
+        value_str = read_line(prompt)
         if value_str.strip() == "":
             print("Please enter a number.")
             continue
@@ -252,7 +595,7 @@ def advice_bot(profile, portfolio=None):
     )
 
     while True:
-        question = input("\nYour question: ").strip()
+        question = read_line("\nYour question: ").strip()
         if question.lower() in ("back", "exit", "quit"):
             print("Returning to main menu.")
             break
@@ -308,7 +651,7 @@ def lesson_financial_literacy():
         "and investing. In this program we focus on budget and investing "
         "examples, but these skills connect in real life."
     )
-    input("\nPress Enter to continue...")
+    read_line("\nPress Enter to continue...")
 
     wrap_print(
         "Income is the money you receive. Expenses are the money you spend. "
@@ -317,7 +660,7 @@ def lesson_financial_literacy():
         "spend more than you make, you may need to borrow, which can create "
         "debt."
     )
-    input("\nPress Enter to continue...")
+    read_line("\nPress Enter to continue...")
 
     wrap_print(
         "Saving means setting money aside in a safe place, often for short "
@@ -326,7 +669,7 @@ def lesson_financial_literacy():
         "go down. In this project we simulate stocks so you can see how "
         "values change over time."
     )
-    input("\nEnd of lesson. Press Enter to return to the main menu...")
+    read_line("\nEnd of lesson. Press Enter to return to the main menu...")
 
 
 def lesson_budgeting(profile):
@@ -347,7 +690,7 @@ def lesson_budgeting(profile):
         f"  Savings / Investing: {rec['Savings / Investing']} percent\n"
         "Again, this is only educational, not advice."
     )
-    input("\nPress Enter to continue into the budget game...")
+    read_line("\nPress Enter to continue into the budget game...")
 
 
 def budget_game(profile):
@@ -390,12 +733,12 @@ def budget_game(profile):
     print(f"  Wants: ${wants:.2f}")
     print(f"  Savings / Investing: ${savings:.2f}")
 
-    input("\nEnd of budget game. Press Enter to return to main menu...")
+    read_line("\nEnd of budget game. Press Enter to return to main menu...")
 
 
 
 
-def investment_simulation(profile):
+def investment_simulation(profile, ticks_per_day=None, feed=None):
     print("\n========== Investment Simulation ==========")
     wrap_print(
         "In this simulation you start with a simple mock portfolio and can "
@@ -404,8 +747,11 @@ def investment_simulation(profile):
         "real investment advice."
     )
 
-    market = StockMarket()
+    market = StockMarket(ticks_per_day=ticks_per_day)
     portfolio = Portfolio(starting_cash=10000.0)
+    if feed is not None:
+        market.listeners.append(feed.publish)
+        feed.publish(market)
 
     while True:
         print("\n----- Investment Menu -----")
@@ -427,7 +773,7 @@ def investment_simulation(profile):
             portfolio.pretty_print(market)
         elif choice == 3:
             market.print_table()
-            ticker = input("Enter ticker to buy (SAFE, GROW, YOLO): ").strip().upper()
+            ticker = read_line("Enter ticker to buy (SAFE, GROW, YOLO): ").strip().upper()
             if ticker not in market.prices:
                 print("That ticker does not exist in this game.")
                 continue
@@ -437,7 +783,7 @@ def investment_simulation(profile):
             print(msg)
         elif choice == 4:
             portfolio.pretty_print(market)
-            ticker = input("Enter ticker to sell (SAFE, GROW, YOLO): ").strip().upper()
+            ticker = read_line("Enter ticker to sell (SAFE, GROW, YOLO): ").strip().upper()
             if ticker not in portfolio.holdings:
                 print("You do not own that ticker.")
                 continue
@@ -449,19 +795,25 @@ def investment_simulation(profile):
             print("Simulating next market day...")
             market.simulate_day()
             market.print_table()
-            time.sleep(0.7)
+            pause(0.7)
             print("\nYour portfolio after the day change:")
             portfolio.pretty_print(market)
         elif choice == 6:
-            ticker = input("Enter ticker to chart (SAFE, GROW, YOLO): ").strip().upper()
+            ticker = read_line("Enter ticker to chart (SAFE, GROW, YOLO): ").strip().upper()
             if ticker not in market.prices:
                 print("That ticker does not exist.")
+            elif market.candles:
+                interval = ask_choice("\nChoose a candle size:", list(CANDLE_INTERVALS))
+                market.print_ascii_candles(ticker, interval)
             else:
                 market.print_ascii_chart(ticker)
         elif choice == 7:
-            ticker = input("Enter ticker to chart (SAFE, GROW, YOLO): ").strip().upper()
+            ticker = read_line("Enter ticker to chart (SAFE, GROW, YOLO): ").strip().upper()
             if ticker not in market.prices:
                 print("That ticker does not exist.")
+            elif market.candles:
+                interval = ask_choice("\nChoose a candle size:", list(CANDLE_INTERVALS))
+                market.plot_candle_chart(ticker, interval)
             else:
                 market.plot_matplotlib_chart(ticker)
         elif choice == 8:
@@ -488,25 +840,50 @@ def simulate_account_growth(start_balance, monthly_contribution, annual_rate_per
     return balances
 
 
-def plot_account_growth(balances, title, label):
-    if not MATPLOTLIB_AVAILABLE:
-        print("\nMatplotlib is not installed. Install it with:")
-        print("  pip install matplotlib")
-        return
+def account_chart_data(balances, title, label):
+    """
+    Arguments for a line chart of monthly balances against years.
+    """
+    years = [m / 12.0 for m in range(len(balances))]
+    return years, balances, title, "Years", label, None
+
+
+def skip_chart(title):
+    """
+    True when the current session (such as a replay) draws no charts.
+    """
+    session = current_session()
+    if session is not None and hasattr(session, "show_chart"):
+        session.show_chart(title)
+        return True
+    return False
 
-    months = list(range(len(balances)))
-    years = [m / 12.0 for m in months]
 
+def show_line_chart(x, y, title, xlabel, ylabel, marker=None):
+    """
+    Pop up a line chart in its own window.
+    """
+    if skip_chart(title):
+        return
     plt.figure()
-    plt.plot(years, balances)
+    plt.plot(x, y, marker=marker)
     plt.title(title)
-    plt.xlabel("Years")
-    plt.ylabel(label)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
     plt.grid(True)
     plt.tight_layout()
     plt.show()
 
 
+def plot_account_growth(balances, title, label):
+    if not MATPLOTLIB_AVAILABLE:
+        print("\nMatplotlib is not installed. Install it with:")
+        print("  pip install matplotlib")
+        return
+
+    show_line_chart(*account_chart_data(balances, title, label))
+
+
 def simple_savings_calculator():
     print("\n========== Simple Savings Growth ==========")
     start = ask_float("Starting balance: ", 0)
@@ -524,7 +901,7 @@ def simple_savings_calculator():
     print(f"Interest growth in this model: about ${interest_earned:,.2f}")
     print("\nThis is a simple compound interest model for learning, not a guarantee.")
 
-    show_chart = input("Show chart of balance over time? (y/n): ").strip().lower()
+    show_chart = read_line("Show chart of balance over time? (y/n): ").strip().lower()
     if show_chart == "y":
         plot_account_growth(balances, "Simple savings growth", "Balance")
 
@@ -552,7 +929,7 @@ def retirement_account_calculator():
     print(f"Growth from returns in this model: about ${growth:,.2f}")
     print("\nThis is an educational model only and not tax or investment advice.")
 
-    show_chart = input("Show chart of account balance over time? (y/n): ").strip().lower()
+    show_chart = read_line("Show chart of account balance over time? (y/n): ").strip().lower()
     if show_chart == "y":
         plot_account_growth(balances, "Retirement account growth", "Balance")
 
@@ -578,11 +955,41 @@ def savings_account_calculator():
     print(f"Total deposited: about ${total_contrib:,.2f}")
     print(f"Interest gained in this model: about ${growth:,.2f}")
 
-    show_chart = input("Show chart of savings balance over time? (y/n): ").strip().lower()
+    show_chart = read_line("Show chart of savings balance over time? (y/n): ").strip().lower()
     if show_chart == "y":
         plot_account_growth(balances, "Savings account growth", "Balance")
 
 
+def mortgage_payment(loan_amount, rate, years):
+    """
+    Fixed rate monthly payment for a loan paid off over the given years.
+    """
+    monthly_rate = rate / 100.0 / 12.0
+    n_payments = years * 12
+
+    if monthly_rate == 0:
+        return loan_amount / n_payments
+    return loan_amount * (monthly_rate * (1 + monthly_rate) ** n_payments) / (
+        (1 + monthly_rate) ** n_payments - 1
+    )
+
+
+def mortgage_balances(loan_amount, rate, years):
+    """
+    Remaining loan balance after each monthly payment.
+    """
+    monthly_rate = rate / 100.0 / 12.0
+    monthly_payment = mortgage_payment(loan_amount, rate, years)
+    balances = []
+    balance = loan_amount
+    for _ in range(years * 12):
+        interest = balance * monthly_rate
+        principal = monthly_payment - interest
+        balance -= principal
+        balances.append(max(balance, 0))
+    return balances
+
+
 def housing_loan_calculator():
     print("\n========== Housing Loan Interest Estimate ==========")
     wrap_print(
@@ -601,16 +1008,8 @@ def housing_loan_calculator():
         print("Your down payment covers the full price in this model. No loan needed.")
         return
 
-    monthly_rate = rate / 100.0 / 12.0
+    monthly_payment = mortgage_payment(loan_amount, rate, years)
     n_payments = years * 12
-
-    if monthly_rate == 0:
-        monthly_payment = loan_amount / n_payments
-    else:
-        monthly_payment = loan_amount * (monthly_rate * (1 + monthly_rate) ** n_payments) / (
-            (1 + monthly_rate) ** n_payments - 1
-        )
-
     total_paid = monthly_payment * n_payments
     total_interest = total_paid - loan_amount
 
@@ -618,32 +1017,17 @@ def housing_loan_calculator():
     print(f"Total paid over {years} years: about ${total_paid:,.2f}")
     print(f"Total interest in this model: about ${total_interest:,.2f}")
 
-    show_chart = input("Show chart of remaining balance over time? (y/n): ").strip().lower()
+    show_chart = read_line("Show chart of remaining balance over time? (y/n): ").strip().lower()
     if show_chart == "y":
         if not MATPLOTLIB_AVAILABLE:
             print("\nMatplotlib is not installed. Install it with:")
             print("  pip install matplotlib")
             return
 
-        balances = []
-        balance = loan_amount
-        for _ in range(n_payments):
-            interest = balance * monthly_rate
-            principal = monthly_payment - interest
-            balance -= principal
-            balances.append(max(balance, 0))
-
-        months = list(range(len(balances)))
-        years_axis = [m / 12.0 for m in months]
-
-        plt.figure()
-        plt.plot(years_axis, balances)
-        plt.title("Estimated remaining mortgage balance")
-        plt.xlabel("Years")
-        plt.ylabel("Balance")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
+        balances = mortgage_balances(loan_amount, rate, years)
+        show_line_chart(*account_chart_data(
+            balances, "Estimated remaining mortgage balance", "Balance"
+        ))
 
 
 def interest_calculators_menu():
@@ -676,7 +1060,7 @@ def interest_calculators_menu():
 
 def create_user_profile():
     print("\n========== Welcome to the Finance Simulator ==========")
-    name = input("First, what is your name? ").strip() or "Player"
+    name = read_line("First, what is your name? ").strip() or "Player"
     age = ask_int("Enter your age: ", 10, 120)
 
     occupations = [
@@ -695,15 +1079,15 @@ def create_user_profile():
 
     print("\nWhat is your main financial goal right now?")
     print("Examples: pay off debt, save for a house, build emergency fund, retire early")
-    goal = input("Type your goal: ").strip() or "Learn about money"
+    goal = read_line("Type your goal: ").strip() or "Learn about money"
 
     profile = UserProfile(name, age, occupation, marital, goal)
     print(profile.summary())
-    input("Press Enter to continue to the main menu...")
+    read_line("Press Enter to continue to the main menu...")
     return profile
 
 
-def main_menu(profile):
+def main_menu(profile, ticks_per_day=None, feed=None):
     while True:
         print("\n========== Main Menu ==========")
         print("  1. Learn financial literacy")
@@ -720,7 +1104,7 @@ def main_menu(profile):
         elif choice == 2:
             budget_game(profile)
         elif choice == 3:
-            investment_simulation(profile)
+            investment_simulation(profile, ticks_per_day, feed)
         elif choice == 4:
             advice_bot(profile)
         elif choice == 5:
@@ -730,10 +1114,700 @@ def main_menu(profile):
             break
 
 
-def main():
+def main(ticks_per_day=None, feed=None):
+    """
+    ticks_per_day turns on intraday candles in the investment game and
+    feed (a MarketFeedPublisher) shares its prices with subscribers.
+    """
     profile = create_user_profile()
-    main_menu(profile)
+    main_menu(profile, ticks_per_day, feed)
+
+
+
+
+
+# ============= SESSION RECORD / REPLAY =============
+
+def record_session(path, ticks_per_day=None, feed=None):
+    """
+    Run the program normally and save every prompt and answer, plus the
+    market seed and tick setting, to a transcript file.
+    """
+    session = RecordingSession(ticks_per_day=ticks_per_day)
+    _session_state.session = session
+    try:
+        main(ticks_per_day, feed)
+    finally:
+        _session_state.session = None
+        session.save(path)
+        print(f"\nSaved {len(session.steps)} answers to {path}.")
+
+
+def load_transcript(path):
+    with open(path) as f:
+        transcript = json.load(f)
+    if "steps" not in transcript or "seed" not in transcript:
+        raise ValueError(f"{path} has no recorded prompts or seed. Record it again with --record.")
+    return transcript
+
+
+def replay_one_session(transcript):
+    """
+    Replay one transcript, with the tick setting it was recorded with,
+    and return its result(). The status is
+    "complete", "incomplete" (answers ran out) or "desynced" (a prompt did
+    not match the recording).
+    """
+    session = ReplaySession(transcript)
+    _session_state.session = session
+    try:
+        main(transcript.get("ticks_per_day"))
+        session.status = "complete"
+    except EOFError:
+        session.status = "incomplete"
+    except TranscriptMismatch:
+        session.status = "desynced"
+    finally:
+        if session.status == "complete":
+            session.finish_action()
+        _session_state.session = None
+    return session.result()
+
+
+def percentile(values, percent):
+    """
+    Nearest-rank percentile of a list of numbers.
+    """
+    ordered = sorted(values)
+    rank = max(1, int(round(percent / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def measure_session_memory(transcripts):
+    """
+    Peak memory of each session, replayed one at a time with tracemalloc
+    on. Kept apart from the timed run because tracing slows it down.
+    """
+    peaks = []
+    for transcript in transcripts:
+        tracemalloc.start()
+        try:
+            replay_one_session(transcript)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return peaks
+
+
+def replay_chunk(transcripts, threads):
+    """
+    Replay part of the load inside one process, `threads` at a time.
+    """
+    real_stdout = sys.stdout
+    sys.stdout = SessionOutput(real_stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return list(pool.map(replay_one_session, transcripts))
+    finally:
+        sys.stdout = real_stdout
+
+
+def replay_sessions(transcripts, workers=32, processes=1, memory_samples=20):
+    """
+    Replay many transcripts at once and return a report with throughput,
+    latency per menu action and memory per session.
+
+    The load is split across `processes` worker processes with up to
+    `workers` threads in each, so the result is not capped at one core by
+    the GIL. Only complete sessions count towards throughput and latency.
+    """
+    processes = max(1, min(processes, len(transcripts)))
+    chunks = [transcripts[i::processes] for i in range(processes)]
+    threads = max(1, min(workers, len(chunks[0])))
+
+    start = time.perf_counter()
+    if processes == 1:
+        results = replay_chunk(chunks[0], threads)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = [
+                result
+                for chunk in pool.map(replay_chunk, chunks, repeat(threads))
+                for result in chunk
+            ]
+    wall_seconds = time.perf_counter() - start
+
+    real_stdout = sys.stdout
+    sys.stdout = SessionOutput(real_stdout)
+    try:
+        memory_peaks = measure_session_memory(transcripts[:memory_samples])
+    finally:
+        sys.stdout = real_stdout
+
+    complete = [r for r in results if r["status"] == "complete"]
+    timings = {}
+    for result in complete:
+        for label, seconds in result["timings"]:
+            timings.setdefault(label, []).append(seconds)
+
+    actions = {}
+    for label, values in sorted(timings.items()):
+        actions[label] = {
+            "count": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+        }
+
+    return {
+        "sessions": len(results),
+        "complete": len(complete),
+        "incomplete": sum(1 for r in results if r["status"] == "incomplete"),
+        "desynced": sum(1 for r in results if r["status"] == "desynced"),
+        "processes": processes,
+        "threads_per_process": threads,
+        "wall_seconds": wall_seconds,
+        "sessions_per_second": len(complete) / wall_seconds if wall_seconds else 0.0,
+        "virtual_sleep_seconds": sum(r["virtual_seconds"] for r in complete),
+        "charts_skipped": sum(r["charts_skipped"] for r in complete),
+        "memory_samples": len(memory_peaks),
+        "memory_per_session_bytes": sum(memory_peaks) / max(1, len(memory_peaks)),
+        "max_memory_per_session_bytes": max(memory_peaks, default=0),
+        "actions": actions,
+    }
+
+
+def print_load_report(report):
+    print("\n========== Replay Load Test ==========")
+    print(f"  Sessions: {report['sessions']} on {report['processes']} processes "
+          f"x {report['threads_per_process']} threads")
+    print(f"  Complete: {report['complete']}, ran out of answers: {report['incomplete']}, "
+          f"prompts did not match: {report['desynced']}")
+    print(f"  Wall time: {report['wall_seconds']:.2f} s")
+    print(f"  Throughput: {report['sessions_per_second']:.1f} complete sessions per second")
+    print(f"  Sleep skipped: {report['virtual_sleep_seconds']:.1f} s")
+    print(f"  Charts skipped: {report['charts_skipped']}")
+    print(f"  Memory per session: {report['memory_per_session_bytes'] / 1024:.1f} KiB "
+          f"average, {report['max_memory_per_session_bytes'] / 1024:.1f} KiB max "
+          f"({report['memory_samples']} sessions replayed alone)")
+    print("\n  Latency per menu action (ms), complete sessions only.")
+    print("  Threads in one process share the GIL, so this includes waiting for it:")
+    print(f"    {'Action':<40} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, stats in report["actions"].items():
+        print(f"    {label:<40} {stats['count']:>7} {stats['p50_ms']:>8.3f} "
+              f"{stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f}")
+
+
+# ============= BATCH REPORT EXPORT =============
+
+class ChartTemplate:
+    """
+    One headless figure that is reused for every chart a worker saves.
+    Only the line data and labels change between charts.
+    """
+
+    def __init__(self):
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        self.line, = self.axes.plot([], [])
+        self.axes.grid(True)
+
+    def save(self, path, x, y, title, xlabel, ylabel, marker=None):
+        self.line.set_data(x, y)
+        self.line.set_marker(marker or "None")
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.axes.set_title(title)
+        self.axes.set_xlabel(xlabel)
+        self.axes.set_ylabel(ylabel)
+        self.figure.tight_layout()
+        self.figure.savefig(path)
+
+
+_chart_template = None
+
+
+def get_chart_template():
+    global _chart_template
+    if _chart_template is None:
+        _chart_template = ChartTemplate()
+    return _chart_template
+
+
+def scenario_charts_and_text(scenario, rng=None):
+    """
+    Build the text summary and the chart data for one profile scenario.
+    rng drives the mock market, if the scenario has one.
+    Returns (text, [(chart name, chart data), ...]).
+    """
+    profile = UserProfile(
+        scenario.get("name", "Player"),
+        scenario["age"],
+        scenario.get("occupation", "Other"),
+        scenario.get("marital_status", "Prefer not to say"),
+        scenario.get("goal", "Learn about money"),
+    )
+    rec = profile.recommended_budget_percentages()
+    lines = [profile.summary()]
+    lines.append("Example budget split:")
+    for category, percent in rec.items():
+        lines.append(f"  {category}: {percent} percent")
+    charts = []
+
+    accounts = [
+        ("savings", "Simple savings growth"),
+        ("retirement", "Retirement account growth"),
+        ("savings_account", "Savings account growth"),
+    ]
+    for key, title in accounts:
+        if key not in scenario:
+            continue
+        plan = scenario[key]
+        balances = simulate_account_growth(
+            plan.get("start", 0), plan.get("monthly", 0),
+            plan.get("rate", 0), plan.get("years", 1)
+        )
+        months = int(plan.get("years", 1) * 12)
+        total_contrib = plan.get("start", 0) + plan.get("monthly", 0) * months
+        lines.append(f"\n{title}:")
+        lines.append(f"  Balance after {plan.get('years', 1)} years: about ${balances[-1]:,.2f}")
+        lines.append(f"  Total put in: about ${total_contrib:,.2f}")
+        lines.append(f"  Growth in this model: about ${balances[-1] - total_contrib:,.2f}")
+        charts.append((key, account_chart_data(balances, title, "Balance")))
+
+    if "mortgage" in scenario:
+        loan = scenario["mortgage"]
+        loan_amount = loan.get("home_price", 0) - loan.get("down_payment", 0)
+        years = int(loan.get("years", 30))
+        lines.append("\nHousing loan estimate:")
+        if loan_amount <= 0:
+            lines.append("  Down payment covers the full price. No loan needed.")
+        else:
+            payment = mortgage_payment(loan_amount, loan.get("rate", 0), years)
+            total_paid = payment * years * 12
+            lines.append(f"  Monthly payment: about ${payment:,.2f}")
+            lines.append(f"  Total paid over {years} years: about ${total_paid:,.2f}")
+            lines.append(f"  Total interest: about ${total_paid - loan_amount:,.2f}")
+            balances = mortgage_balances(loan_amount, loan.get("rate", 0), years)
+            charts.append(("mortgage", account_chart_data(
+                balances, "Estimated remaining mortgage balance", "Balance"
+            )))
+
+    if scenario.get("market_days"):
+        market = StockMarket(rng=rng)
+        for _ in range(int(scenario["market_days"])):
+            market.simulate_day()
+        lines.append(f"\nMock market after {market.day} days:")
+        for ticker, price in market.prices.items():
+            lines.append(f"  {ticker}: ${price:.2f}")
+            charts.append((ticker.lower(), market.chart_data(ticker)))
+
+    lines.append("\nThis report is for learning only, not financial advice.")
+    return "\n".join(lines) + "\n", charts
+
+
+# Smallest years each account calculator accepts when asked interactively.
+ACCOUNT_MIN_YEARS = {"savings": 0.1, "retirement": 1, "savings_account": 0.1}
+
+
+def validate_scenario(scenario):
+    """
+    Raise ValueError for inputs the interactive calculators would refuse.
+    """
+    if not isinstance(scenario, dict):
+        raise ValueError("scenario must be a JSON object")
+    age = scenario.get("age")
+    if not isinstance(age, int) or not 10 <= age <= 120:
+        raise ValueError("age is required and must be a whole number from 10 to 120")
+    for key, min_years in ACCOUNT_MIN_YEARS.items():
+        if key in scenario:
+            plan = scenario[key]
+            for field in ("start", "monthly", "rate"):
+                if plan.get(field, 0) < 0:
+                    raise ValueError(f"{key} {field} must be at least 0")
+            if plan.get("years", 1) < min_years:
+                raise ValueError(f"{key} years must be at least {min_years}")
+    if "mortgage" in scenario:
+        loan = scenario["mortgage"]
+        if loan.get("home_price", 0) < 0.01:
+            raise ValueError("mortgage home_price must be at least 0.01")
+        if loan.get("down_payment", 0) < 0 or loan.get("rate", 0) < 0:
+            raise ValueError("mortgage down_payment and rate must be at least 0")
+        years = loan.get("years", 30)
+        if not isinstance(years, int) or years < 1:
+            raise ValueError("mortgage years must be a whole number of at least 1")
+    if int(scenario.get("market_days", 0)) < 0:
+        raise ValueError("market_days must be at least 0")
+
+
+def export_scenario_report(index, scenario, out_dir, formats):
+    """
+    Write one scenario's text summary and charts. Runs in a worker process.
+    Files start with the scenario's position in the list so that
+    scenarios sharing a name or id do not overwrite each other.
+    """
+    validate_scenario(scenario)
+    # Own generator per scenario, so a seed never leaks into the next
+    # scenario the same worker happens to run.
+    rng = random.Random(scenario.get("seed"))
+    text, charts = scenario_charts_and_text(scenario, rng)
+    report_id = str(scenario.get("id", scenario.get("name", "report")))
+    slug = f"{index:05d}_" + "".join(c if c.isalnum() else "_" for c in report_id)
+
+    written = []
+    text_path = os.path.join(out_dir, f"{slug}.txt")
+    with open(text_path, "w") as f:
+        f.write(text)
+    written.append(text_path)
+
+    if MATPLOTLIB_AVAILABLE:
+        template = get_chart_template()
+        for name, data in charts:
+            for fmt in formats:
+                path = os.path.join(out_dir, f"{slug}_{name}.{fmt}")
+                template.save(path, *data)
+                written.append(path)
+    return written
+
+
+def _export_worker(job):
+    """
+    Catch errors per scenario so one bad entry does not stop the batch.
+    """
+    try:
+        return export_scenario_report(*job), None
+    except Exception as error:
+        return [], f"{type(error).__name__}: {error}"
+
+
+def export_reports(scenarios, out_dir, formats=("png",), processes=None):
+    """
+    Render reports for many scenarios at once across a process pool.
+    Returns (written paths, [(scenario index, error message), ...]).
+    """
+    if not MATPLOTLIB_AVAILABLE:
+        print("\nMatplotlib is not installed, so only text summaries will be written.")
+    os.makedirs(out_dir, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+    jobs = [(index, scenario, out_dir, tuple(formats))
+            for index, scenario in enumerate(scenarios)]
+    chunksize = max(1, len(jobs) // (processes * 4))
+
+    written = []
+    failed = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = pool.map(_export_worker, jobs, chunksize=chunksize)
+        for index, (paths, error) in enumerate(results):
+            written.extend(paths)
+            if error is not None:
+                failed.append((index, error))
+    return written, failed
+
+
+# ============= MARKET DATA FEED =============
+
+# Messages are a 2 byte length followed by a header of
+# (kind, day, item count). A snapshot lists every ticker name and price so
+# a new subscriber knows the order; a delta only sends (ticker index, price)
+# for the prices that moved since that subscriber's last message.
+FEED_SNAPSHOT = 1
+FEED_DELTA = 2
+_FEED_LENGTH = struct.Struct("!H")
+_FEED_HEADER = struct.Struct("!BIB")
+_FEED_NAME_LENGTH = struct.Struct("!B")
+_FEED_PRICE = struct.Struct("!d")
+_FEED_DELTA_ITEM = struct.Struct("!Bd")
+
+def encode_snapshot(day, tickers, prices):
+    body = [_FEED_HEADER.pack(FEED_SNAPSHOT, day, len(tickers))]
+    for ticker, price in zip(tickers, prices):
+        name = ticker.encode()
+        body.append(_FEED_NAME_LENGTH.pack(len(name)) + name + _FEED_PRICE.pack(price))
+    body = b"".join(body)
+    return _FEED_LENGTH.pack(len(body)) + body
+
+
+def encode_delta(day, changes):
+    body = _FEED_HEADER.pack(FEED_DELTA, day, len(changes)) + b"".join(
+        _FEED_DELTA_ITEM.pack(index, price) for index, price in changes
+    )
+    return _FEED_LENGTH.pack(len(body)) + body
+
+
+def read_feed_message(stream):
+    """
+    Read one message from a binary file object.
+    Returns (kind, day, items) or None when the publisher has gone away.
+    """
+    length_bytes = stream.read(_FEED_LENGTH.size)
+    if len(length_bytes) < _FEED_LENGTH.size:
+        return None
+    (length,) = _FEED_LENGTH.unpack(length_bytes)
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+
+    kind, day, count = _FEED_HEADER.unpack_from(body)
+    offset = _FEED_HEADER.size
+    items = []
+    for _ in range(count):
+        if kind == FEED_SNAPSHOT:
+            (name_length,) = _FEED_NAME_LENGTH.unpack_from(body, offset)
+            offset += _FEED_NAME_LENGTH.size
+            name = body[offset:offset + name_length].decode()
+            offset += name_length
+            (price,) = _FEED_PRICE.unpack_from(body, offset)
+            offset += _FEED_PRICE.size
+            items.append((name, price))
+        else:
+            items.append(_FEED_DELTA_ITEM.unpack_from(body, offset))
+            offset += _FEED_DELTA_ITEM.size
+    return kind, day, items
+
+
+def feed_socket(address):
+    """
+    "host:port" means TCP, anything else is a Unix socket path.
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return socket.socket(socket.AF_INET, socket.SOCK_STREAM), (host, int(port))
+    return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM), address
+
+
+def is_socket_file(path):
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+class MarketFeedPublisher:
+    """
+    Pushes StockMarket days to any number of local subscribers.
+
+    publish only stores the newest prices and wakes the subscriber
+    threads, so the simulation loop does the same small amount of work no
+    matter how many subscribers there are. A subscriber that falls behind
+    skips straight to the newest prices instead of getting every day.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        self.tickers = []
+        self.prices = []
+        self.day = 0
+        self.version = 0
+        self.closed = False
+        self.changed = threading.Condition()
+        self.market = None
+        self.subscribers = {}  # thread -> connection
+
+        self.server, bind_address = feed_socket(address)
+        if self.server.family == socket.AF_UNIX:
+            if os.path.exists(address):
+                if not is_socket_file(address):
+                    self.server.close()
+                    raise FileExistsError(f"{address} exists and is not a socket.")
+                os.remove(address)  # left over from an earlier run
+        elif self.server.family == socket.AF_INET:
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(bind_address)
+        self.server.listen()
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+
+    def publish(self, market):
+        with self.changed:
+            if market is not self.market or list(market.prices) != self.tickers:
+                # A new tickers list makes every subscriber get a snapshot,
+                # so a new market is not mistaken for a continuation.
+                self.market = market
+                self.tickers = list(market.prices)
+            self.prices = list(market.prices.values())
+            self.day = market.day
+            self.version += 1
+            self.changed.notify_all()
+
+    def accept_loop(self):
+        while not self.closed:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                break
+            if conn.family != socket.AF_UNIX:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            thread = threading.Thread(target=self.serve_subscriber, args=(conn,), daemon=True)
+            with self.changed:
+                self.subscribers[thread] = conn
+            thread.start()
+
+    def serve_subscriber(self, conn):
+        with self.changed:
+            version, day = self.version, self.day
+            tickers, prices = self.tickers, list(self.prices)
+        try:
+            conn.sendall(encode_snapshot(day, tickers, prices))
+            sent_tickers, sent_prices = tickers, prices
+            while True:
+                with self.changed:
+                    while self.version == version and not self.closed:
+                        self.changed.wait()
+                    if self.version == version:
+                        break  # closed and nothing left to send
+                    version, day = self.version, self.day
+                    tickers, prices = self.tickers, list(self.prices)
+
+                if tickers is not sent_tickers:
+                    conn.sendall(encode_snapshot(day, tickers, prices))
+                else:
+                    changes = [
+                        (i, price) for i, (price, old) in enumerate(zip(prices, sent_prices))
+                        if price != old
+                    ]
+                    conn.sendall(encode_delta(day, changes))
+                sent_tickers, sent_prices = tickers, prices
+        except OSError:
+            pass  # subscriber went away
+        finally:
+            conn.close()
+            with self.changed:
+                self.subscribers.pop(threading.current_thread(), None)
+
+    def close(self):
+        with self.changed:
+            self.closed = True
+            self.changed.notify_all()
+            subscribers = list(self.subscribers.items())
+        self.server.close()
+
+        # Give subscribers one shared second to get the last day, then cut
+        # off any that stopped reading and are stuck in sendall.
+        deadline = time.monotonic() + 1.0
+        for thread, _ in subscribers:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        for thread, conn in subscribers:
+            if thread.is_alive():
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                thread.join(timeout=1.0)
+        if self.server.family == socket.AF_UNIX and is_socket_file(self.address):
+            os.remove(self.address)
+
+
+def subscribe_market_feed(address):
+    """
+    Yield (day, prices) for every update from a publisher.
+    """
+    sock, connect_address = feed_socket(address)
+    sock.connect(connect_address)
+    with sock, sock.makefile("rb") as stream:
+        tickers = []
+        prices = {}
+        while True:
+            message = read_feed_message(stream)
+            if message is None:
+                return
+            kind, day, items = message
+            if kind == FEED_SNAPSHOT:
+                tickers = [name for name, _ in items]
+                prices = dict(items)
+            else:
+                for index, price in items:
+                    prices[tickers[index]] = price
+            yield day, dict(prices)
+
+
+def run_market_clock(feed, days, tick_seconds, ticks_per_day=None):
+    """
+    Run a market with no game attached so subscribers have prices to follow.
+    """
+    market = StockMarket(ticks_per_day=ticks_per_day)
+    market.listeners.append(feed.publish)
+    feed.publish(market)
+    for _ in range(days):
+        time.sleep(tick_seconds)
+        market.simulate_day()
+
+
+def positive_int(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be more than 0, got {value}")
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Finance Simulator")
+    parser.add_argument("--record", metavar="FILE",
+                        help="play normally and save your answers to FILE")
+    parser.add_argument("--replay", metavar="FILE", nargs="+",
+                        help="replay saved transcripts as a load test")
+    parser.add_argument("--sessions", type=int, default=1000,
+                        help="number of sessions to replay (default 1000)")
+    parser.add_argument("--workers", type=int, default=32,
+                        help="replayed sessions running at once in each process (default 32)")
+    parser.add_argument("--export", metavar="FILE",
+                        help="write reports for every scenario in a JSON file")
+    parser.add_argument("--out", metavar="DIR", default="reports",
+                        help="folder for exported reports (default reports)")
+    parser.add_argument("--formats", nargs="+", default=["png"],
+                        choices=["png", "svg"], help="chart file types")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes for export and replay (default: all cores)")
+    parser.add_argument("--publish", metavar="ADDRESS",
+                        help="share market prices on host:port or a Unix socket path")
+    parser.add_argument("--subscribe", metavar="ADDRESS",
+                        help="print prices from a running publisher")
+    parser.add_argument("--market-days", type=int, default=None,
+                        help="with --publish, run the market alone for this many days")
+    parser.add_argument("--tick-seconds", type=float, default=1.0,
+                        help="seconds between days for --market-days (default 1)")
+    parser.add_argument("--ticks-per-day", type=positive_int, default=None,
+                        help="simulate this many price ticks per day and show candles")
+    args = parser.parse_args(argv)
+    if args.market_days is not None and not args.publish:
+        parser.error("--market-days needs --publish")
+    return args
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    feed = MarketFeedPublisher(args.publish) if args.publish else None
+
+    if args.subscribe:
+        for day, prices in subscribe_market_feed(args.subscribe):
+            quotes = "  ".join(f"{t}: ${p:.2f}" for t, p in prices.items())
+            print(f"Day {day:>4}  {quotes}")
+    elif args.publish and args.market_days is not None:
+        run_market_clock(feed, args.market_days, args.tick_seconds, args.ticks_per_day)
+    elif args.record:
+        record_session(args.record, args.ticks_per_day, feed)
+    elif args.replay:
+        recorded = [load_transcript(path) for path in args.replay]
+        for path, transcript in zip(args.replay, recorded):
+            saved_ticks = transcript.get("ticks_per_day")
+            if args.ticks_per_day is not None and args.ticks_per_day != saved_ticks:
+                raise SystemExit(
+                    f"{path} was recorded with ticks_per_day={saved_ticks}, "
+                    f"not {args.ticks_per_day}. Replay uses the recorded setting."
+                )
+        transcripts = [recorded[i % len(recorded)] for i in range(args.sessions)]
+        processes = args.processes or os.cpu_count() or 1
+        print_load_report(replay_sessions(transcripts, args.workers, processes))
+    elif args.export:
+        with open(args.export) as f:
+            scenarios = json.load(f)
+        start = time.perf_counter()
+        written, failed = export_reports(scenarios, args.out, args.formats, args.processes)
+        print(f"Wrote {len(written)} files for {len(scenarios) - len(failed)} scenarios "
+              f"in {time.perf_counter() - start:.1f} s.")
+        for index, error in failed:
+            print(f"  Scenario {index} skipped: {error}")
+    else:
+        main(args.ticks_per_day, feed)
+
+    if feed is not None:
+        feed.close()